@@ -49,6 +49,11 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Show build plan without executing",
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached fonts without checking for upstream updates",
+    )
     parser.add_argument(
         "--list-scripts",
         action="store_true",
@@ -87,9 +92,9 @@ def main(argv: list[str] | None = None) -> None:
         return
 
     if config.weights:
-        outputs = build_all(config)
+        outputs = build_all(config, offline=args.offline)
         for output in outputs:
             print(f"Built: {output} ({output.stat().st_size / 1024:.1f} KB)")
     else:
-        output = build(config)
+        output = build(config, offline=args.offline)
         print(f"Built: {output} ({output.stat().st_size / 1024:.1f} KB)")
@@ -20,6 +20,8 @@ class ScriptEntry:
     charset_file: str | None = None
     scale: bool = True       # scale glyphs to match target cap ratio
     weights: list[str] = field(default_factory=list)  # available weights; empty = all
+    # Resolved codepoints, filled in lazily by the pipeline.
+    _cps_cache: frozenset[int] | None = field(default=None, init=False, repr=False, compare=False)
 
 
 @dataclass
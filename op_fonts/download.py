@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
 from pathlib import Path
 from urllib.error import HTTPError, URLError
-from urllib.parse import quote
 from urllib.request import Request, urlopen
 
 from .config import BuildConfig
@@ -16,21 +20,29 @@ log = logging.getLogger(__name__)
 _USER_AGENT = "op_fonts/0.1"
 _MAX_RETRIES = 3
 _RETRY_DELAY = 2.0  # seconds
+_MAX_WORKERS = 8
+_CHUNK_SIZE = 1 << 20  # 1 MiB
 
 
 def _download(url: str, dest: Path) -> None:
     """Download url to dest with retries."""
     log.info("Downloading %s", url)
     req = Request(url, headers={"User-Agent": _USER_AGENT})
+    # Stream into a .part file and rename on success so an interrupted
+    # download never leaves a truncated font in the cache.
+    tmp = dest.with_suffix(dest.suffix + ".part")
+    dest.parent.mkdir(parents=True, exist_ok=True)
     for attempt in range(1, _MAX_RETRIES + 1):
         try:
-            with urlopen(req, timeout=60) as resp:
-                data = resp.read()
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            dest.write_bytes(data)
-            log.debug("Saved %s (%d bytes)", dest, len(data))
+            with urlopen(req, timeout=60) as resp, open(tmp, "wb") as f:
+                shutil.copyfileobj(resp, f, _CHUNK_SIZE)
+                validators = _validators(resp.headers)
+            os.replace(tmp, dest)
+            _meta_path(dest).write_text(json.dumps(validators))
+            log.debug("Saved %s (%d bytes)", dest, dest.stat().st_size)
             return
-        except (HTTPError, URLError, OSError) as exc:
+        except (HTTPError, URLError, OSError, HTTPException) as exc:
+            tmp.unlink(missing_ok=True)
             if attempt == _MAX_RETRIES:
                 raise RuntimeError(f"Failed to download {url} after {_MAX_RETRIES} attempts") from exc
             log.warning("Attempt %d/%d failed for %s: %s", attempt, _MAX_RETRIES, url, exc)
@@ -41,14 +53,79 @@ def _cache_path(cache_dir: Path, font_name: str) -> Path:
     return cache_dir / font_name
 
 
-def ensure_font(cache_dir: Path, font_name: str, url: str) -> Path:
-    """Return local path to a font, downloading if needed."""
-    cached = _cache_path(cache_dir, font_name)
+def _meta_path(cached: Path) -> Path:
+    """Sidecar file holding the HTTP cache validators of a cached font."""
+    return cached.with_name(cached.name + ".meta.json")
+
+
+def _validators(headers) -> dict[str, str | None]:
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+def _fetch_headers(url: str, headers: dict[str, str]):
+    """HEAD url and return the response headers.
+
+    Servers that refuse HEAD get a GET with the same headers instead; only the
+    headers are read, the body is left on the wire.
+    """
+    try:
+        with urlopen(Request(url, headers=headers, method="HEAD"), timeout=30) as resp:
+            return resp.headers
+    except HTTPError as exc:
+        if exc.code not in (405, 501):
+            raise
+    with urlopen(Request(url, headers=headers), timeout=30) as resp:
+        return resp.headers
+
+
+def _needs_download(url: str, cached: Path) -> bool:
+    """Check url against the cached copy; True if it must be (re)downloaded.
+
+    Cached fonts are revalidated with the ETag / Last-Modified validators saved
+    alongside them, so an unchanged font costs one 304 response. Fonts cached
+    without validators are only refetched if their size no longer matches.
+    If the check fails, a cached copy is kept; without one, a 404/410 raises
+    RuntimeError and anything else is left to the download retries.
+    """
+    meta: dict[str, str | None] = {}
+    headers = {"User-Agent": _USER_AGENT}
     if cached.exists():
-        log.debug("Cache hit: %s", cached)
-        return cached
-    _download(url, cached)
-    return cached
+        try:
+            meta = json.loads(_meta_path(cached).read_text())
+        except (OSError, ValueError):
+            pass
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        info = _fetch_headers(url, headers)
+    except HTTPError as exc:
+        if exc.code == 304:
+            log.debug("Cache hit (not modified): %s", cached)
+            return False
+        if cached.exists():
+            log.warning("Could not revalidate %s, using cached copy: HTTP %d %s", cached.name, exc.code, exc.reason)
+            return False
+        if exc.code in (404, 410):
+            raise RuntimeError(f"{url}: HTTP {exc.code} {exc.reason}") from exc
+        return True  # let the download retries deal with it
+    except (URLError, OSError, HTTPException) as exc:
+        if cached.exists():
+            log.warning("Could not revalidate %s, using cached copy: %s", cached.name, exc)
+            return False
+        return True  # let the download retries deal with it
+
+    if not cached.exists():
+        return True
+    length = info.get("Content-Length")
+    if length is not None and int(length) != cached.stat().st_size:
+        return True
+    if len(headers) > 1 and _validators(info) != {k: meta.get(k) for k in ("etag", "last_modified")}:
+        return True
+    log.debug("Cache hit: %s", cached)
+    return False
 
 
 def get_download_plan(config: BuildConfig) -> list[tuple[str, str, Path]]:
@@ -60,3 +137,53 @@ def get_download_plan(config: BuildConfig) -> list[tuple[str, str, Path]]:
         cached = _cache_path(config.cache_dir, script.font)
         plan.append((script.font, script.url, cached))
     return plan
+
+
+def download_plan_parallel(
+    plan: list[tuple[str, str, Path]],
+    workers: int = _MAX_WORKERS,
+    offline: bool = False,
+) -> dict[str, Path]:
+    """Check and fetch every entry of a download plan concurrently.
+
+    All URLs are HEAD-checked first, so a broken URL fails the whole plan
+    before anything is downloaded (or built). Stale and missing fonts are then
+    downloaded in parallel. Scripts that share a font file are fetched once.
+    With offline=True cached fonts are used without contacting the server.
+    Returns a dict of font name → local path.
+    """
+    paths: dict[str, Path] = {}
+    entries: dict[Path, str] = {}
+    for name, url, cached in plan:
+        paths[name] = cached
+        entries.setdefault(cached, url)
+
+    if offline:
+        stale = {dest: url for dest, url in entries.items() if not dest.exists()}
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(entries) or 1)) as ex:
+            checks = {dest: ex.submit(_needs_download, url, dest) for dest, url in entries.items()}
+        stale, errors = {}, []
+        for dest, fut in checks.items():
+            try:
+                if fut.result():
+                    stale[dest] = entries[dest]
+            except RuntimeError as exc:
+                errors.append(str(exc))
+        if errors:
+            raise RuntimeError("Cannot fetch source fonts:\n  " + "\n  ".join(errors))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(workers, len(stale))) as ex:
+            futures = [ex.submit(_download, url, dest) for dest, url in stale.items()]
+            for fut in futures:
+                fut.result()
+    return paths
+
+
+def prefetch_all(config: BuildConfig, offline: bool = False) -> dict[str, Path]:
+    """Check, then download or revalidate, every source font an enabled script needs.
+
+    Returns a dict of font name → local path.
+    """
+    return download_plan_parallel(get_download_plan(config), offline=offline)
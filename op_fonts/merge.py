@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-import shutil
 from pathlib import Path
 
 from fontTools.merge import Merger
@@ -16,7 +15,7 @@ _TTF_GLYPH_LIMIT = 65535
 
 def _is_cff(font_path: Path) -> bool:
     """Check if a font has CFF outlines."""
-    font = TTFont(font_path)
+    font = TTFont(font_path, lazy=True)
     result = "CFF " in font or "CFF2" in font
     font.close()
     return result
@@ -24,7 +23,7 @@ def _is_cff(font_path: Path) -> bool:
 
 def _ensure_cff(font_path: Path) -> Path:
     """If font has glyf outlines (TTF), convert to CFF. Quadratic→cubic is lossless."""
-    font = TTFont(font_path)
+    font = TTFont(font_path, lazy=True)
     if "CFF " in font or "CFF2" in font:
         font.close()
         return font_path
@@ -85,7 +84,7 @@ def _ensure_cff(font_path: Path) -> Path:
 
 def _ensure_quadratic(font_path: Path) -> Path:
     """If font has CFF outlines (OTF), convert to quadratic TrueType outlines."""
-    font = TTFont(font_path)
+    font = TTFont(font_path, lazy=True)
     if "CFF " not in font and "CFF2" not in font:
         font.close()
         return font_path
@@ -146,7 +145,7 @@ def _decid_cff(font_path: Path) -> Path:
 
     Rebuilds the font from scratch via T2CharStringPen to ensure clean name-keyed output.
     """
-    font = TTFont(font_path)
+    font = TTFont(font_path, lazy=True)
     if "CFF " not in font:
         font.close()
         return font_path
@@ -283,22 +282,23 @@ def _rebuild_cmap(font: TTFont) -> None:
 
 def merge_fonts(
     font_paths: list[Path],
-    output_path: Path,
     drop_tables: list[str] | None = None,
-) -> Path:
+) -> TTFont:
     """Merge multiple font files into one.
 
     Auto-detects outline format: if majority are CFF, converts outliers
     to CFF and outputs OTF. Otherwise converts to TTF.
     The first font in the list defines baseline metrics.
+
+    Returns the merged font unsaved, so callers can keep editing it and
+    write it out once.
     """
     if not font_paths:
         raise ValueError("No fonts to merge")
 
     if len(font_paths) == 1:
-        log.info("Only one font — copying directly to output")
-        shutil.copy2(font_paths[0], output_path)
-        return output_path
+        log.info("Only one font — using it directly as output")
+        return TTFont(font_paths[0])
 
     # Determine dominant outline format
     cff_count = sum(1 for p in font_paths if _is_cff(p))
@@ -307,8 +307,9 @@ def merge_fonts(
     fmt_name = "CFF" if use_cff else "TTF"
     log.info("Outline format: %s (%d/%d CFF inputs)", fmt_name, cff_count, len(font_paths))
 
-    target_upm = TTFont(font_paths[0])["head"].unitsPerEm
-    TTFont(font_paths[0]).close()
+    base = TTFont(font_paths[0], lazy=True)
+    target_upm = base["head"].unitsPerEm
+    base.close()
 
     processed: list[Path] = []
     for p in font_paths:
@@ -333,10 +334,4 @@ def merge_fonts(
     log.info("Merged glyph count: %d", glyph_count)
 
     _rebuild_cmap(merged)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    merged.save(str(output_path))
-    merged.close()
-
-    log.info("Merged font saved: %s (%.1f KB)", output_path, output_path.stat().st_size / 1024)
-    return output_path
+    return merged
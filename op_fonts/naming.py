@@ -3,23 +3,26 @@
 from __future__ import annotations
 
 import logging
-from pathlib import Path
 
 from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables._n_a_m_e import makeName
 
 log = logging.getLogger(__name__)
 
 
 def rename_font(
-    font_path: Path,
+    font: TTFont,
     family_name: str,
     style_name: str,
     version: str = "1.000",
     copyright: str = "",
     designer: str = "",
 ) -> None:
-    """Rewrite the name table to use the given family/style names."""
-    font = TTFont(font_path)
+    """Rewrite the name table of an open font to use the given family/style names.
+
+    Only the in-memory name table is modified; the caller is responsible for
+    saving the font.
+    """
     name_table = font["name"]
 
     full_name = f"{family_name}-{style_name}"
@@ -41,11 +44,19 @@ def rename_font(
     if designer:
         entries[9] = designer
 
+    # (nameID, platformID, platEncID, langID) → value. Update matching records
+    # in one pass over the table, then append whatever was missing; calling
+    # setName per entry would rescan the whole table each time.
+    targets = {}
     for name_id, value in entries.items():
-        name_table.setName(value, name_id, 3, 1, 0x0409)  # Windows, Unicode BMP, English
-        name_table.setName(value, name_id, 1, 0, 0)        # Mac, Roman, English
+        targets[(name_id, 3, 1, 0x0409)] = value  # Windows, Unicode BMP, English
+        targets[(name_id, 1, 0, 0)] = value       # Mac, Roman, English
 
-    font.save(str(font_path))
-    font.close()
+    for record in name_table.names:
+        key = (record.nameID, record.platformID, record.platEncID, record.langID)
+        if key in targets:
+            record.string = targets.pop(key)
+    for (name_id, platform_id, enc_id, lang_id), value in targets.items():
+        name_table.names.append(makeName(value, name_id, platform_id, enc_id, lang_id))
 
-    log.info("Renamed font: %s → %s %s", font_path.name, family_name, style_name)
+    log.info("Renamed font → %s %s", family_name, style_name)
@@ -3,14 +3,26 @@
 from __future__ import annotations
 
 import copy
+import dataclasses
 import logging
+import mmap
+import os
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 
+from fontTools.misc.fixedTools import otRound
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.subset import Options, Subsetter
+from fontTools.ttLib import TTFont
+
 from .charsets import load_charset_file
 from .config import BuildConfig
-from .download import ensure_font, get_download_plan
+from .download import download_plan_parallel, get_download_plan, prefetch_all
 from .merge import merge_fonts
 from .naming import rename_font
 from .subset import parse_unicode_ranges, subset_font
@@ -19,19 +31,28 @@ log = logging.getLogger(__name__)
 
 
 
-def _resolve_codepoints(script, config: BuildConfig) -> list[int]:
-    """Resolve the full codepoint list for a script entry.
+def _resolve_codepoints(script, config: BuildConfig) -> frozenset[int]:
+    """Resolve the full codepoint set for a script entry.
 
     If charset_file is set, load codepoints from it and merge with unicode_ranges
     (so CJK ideographs come from the charset, but punctuation/fullwidth ranges
     are still included from unicode_ranges).
+
+    The result is cached on the script entry, so ranges and charset files are
+    only parsed once.
     """
+    if script._cps_cache is None:
+        script._cps_cache = _load_codepoints(script, config)
+    return script._cps_cache
+
+
+def _load_codepoints(script, config: BuildConfig) -> frozenset[int]:
     if script.charset_file:
         charset_path = Path(script.charset_file)
         if not charset_path.is_absolute():
             # Resolve relative to config's cache dir parent (project root)
             charset_path = config.cache_dir.parent / charset_path
-        charset_cps = set(load_charset_file(charset_path))
+        charset_cps = frozenset(load_charset_file(charset_path))
         log.info(
             "%s: loaded %d codepoints from charset file %s",
             script.name, len(charset_cps), charset_path,
@@ -40,36 +61,133 @@ def _resolve_codepoints(script, config: BuildConfig) -> list[int]:
         if script.unicode_ranges:
             range_cps = set(parse_unicode_ranges(script.unicode_ranges))
             charset_cps |= range_cps
-        return sorted(charset_cps)
-    return parse_unicode_ranges(script.unicode_ranges)
+        return charset_cps
+    return frozenset(parse_unicode_ranges(script.unicode_ranges))
+
+
+@contextmanager
+def _open_font_ro(font_path: Path):
+    """Open a font lazily over a read-only memory map.
+
+    Only the pages backing the tables that are actually read get faulted in,
+    instead of the whole file being copied into a bytes object.
+    """
+    with open(font_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        font = TTFont(mm, lazy=True)
+        try:
+            yield font
+        finally:
+            font.close()
+
+
+def _plan_subsets(enabled, font_paths: dict[str, Path], config: BuildConfig) -> list[tuple]:
+    """Resolve the deduplicated codepoints each script contributes.
+
+    Later scripts only get codepoints not already covered by an earlier one.
+    Coverage is tracked against each source font's cmap (a font may not have
+    all requested codepoints), which is what the subset output would contain.
+    Returns (script, source_path, codepoints) tuples for scripts with work to do.
+    """
+    cmaps: dict[Path, dict[int, str]] = {}
+    covered_cps: set[int] = set()
+    jobs: list[tuple] = []
+
+    for script in enabled:
+        src = font_paths[script.name]
+        wanted = _resolve_codepoints(script, config) - covered_cps
+        if not wanted:
+            log.info("Skipping %s: all codepoints already covered", script.name)
+            continue
+        codepoints = sorted(wanted)
+        if src not in cmaps:
+            with _open_font_ro(src) as font:
+                cmaps[src] = font.getBestCmap() or {}
+        present = cmaps[src].keys() & wanted
+        if not present:
+            log.warning("Skipping %s: no matching glyphs in %s for given ranges", script.name, src.name)
+            continue
+        covered_cps.update(present)
+        jobs.append((script, src, codepoints))
+    return jobs
+
+
+def _subset_job(src: Path, codepoints: list[int], out: Path, target_ratio: float) -> Path:
+    """Subset one source font and scale it to target_ratio (0 = no scaling), saving once.
+
+    Runs in a worker process.
+    """
+    scale = partial(_scale_to_target, target_cap_ratio=target_ratio, name=out.name) if target_ratio > 0 else None
+    return subset_font(src, codepoints=codepoints, output_path=out, transform=scale)
 
 
 def dry_run(config: BuildConfig) -> None:
     """Print the build plan without executing anything."""
     enabled = [s for s in config.scripts if s.enabled]
-    print(f"Output: {config.output}")
-    print(f"Cache: {config.cache_dir}")
-    print(f"\nEnabled scripts ({len(enabled)}):")
+    # Collected and printed in one write rather than a print per line.
+    lines = [f"Output: {config.output}", f"Cache: {config.cache_dir}"]
+    lines.append(f"\nEnabled scripts ({len(enabled)}):")
     for s in enabled:
         cps = _resolve_codepoints(s, config)
         charset_tag = f" [charset: {s.charset_file}]" if s.charset_file else ""
-        print(f"  {s.name}: {s.font} → {len(cps)} codepoints{charset_tag}")
+        lines.append(f"  {s.name}: {s.font} → {len(cps)} codepoints{charset_tag}")
 
-    print(f"\nDownload plan:")
+    lines.append(f"\nDownload plan:")
+    listings: dict[Path, set[str]] = {}
     for name, url, cached in get_download_plan(config):
-        status = "cached" if cached.exists() else "download"
-        print(f"  [{status}] {name}")
-        print(f"    {url}")
+        if cached.parent not in listings:
+            listings[cached.parent] = _list_dir(cached.parent)
+        status = "cached" if cached.name in listings[cached.parent] else "download"
+        lines.append(f"  [{status}] {name}")
+        lines.append(f"    {url}")
 
-    print(f"\nMerge order (first = baseline metrics):")
+    lines.append(f"\nMerge order (first = baseline metrics):")
     for i, s in enumerate(enabled):
-        print(f"  {i + 1}. {s.font} ({s.name})")
-    print(f"\nDrop tables: {config.merge.drop_tables}")
-    print(f"Final name: {config.name} {config.style}")
+        lines.append(f"  {i + 1}. {s.font} ({s.name})")
+    lines.append(f"\nDrop tables: {config.merge.drop_tables}")
+    lines.append(f"Final name: {config.name} {config.style}")
+    print("\n".join(lines))
+
+
+def _list_dir(path: Path) -> set[str]:
+    """Names in a directory from a single readdir (empty if it doesn't exist).
+
+    Cheaper than a stat per cached font, which matters on network mounts.
+    """
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return set()
+
+
+def _init_worker_logging(level: int, formatter: logging.Formatter | None) -> None:
+    # Forked workers inherit the parent's handlers; spawned ones start bare.
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers log like this process does."""
+    root = logging.getLogger()
+    formatter = root.handlers[0].formatter if root.handlers else None
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker_logging,
+        initargs=(root.level, formatter),
+    )
 
 
-def build(config: BuildConfig) -> Path:
-    """Execute the full build pipeline. Returns the path to the output font."""
+def build(config: BuildConfig, offline: bool = False, workers: int | None = None) -> Path:
+    """Execute the full build pipeline. Returns the path to the output font.
+
+    With offline=True, cached source fonts are used without checking for
+    upstream updates. workers caps the subset process pool (default: one per
+    CPU).
+    """
     enabled = [s for s in config.scripts if s.enabled]
     if not enabled:
         raise RuntimeError("No scripts enabled — nothing to build")
@@ -78,85 +196,88 @@ def build(config: BuildConfig) -> Path:
 
     # 1. Download
     log.info("Step 1/5: Downloading fonts...")
-    font_paths: dict[str, Path] = {}
-    for script in enabled:
-        font_paths[script.name] = ensure_font(config.cache_dir, script.font, script.url)
+    fonts = prefetch_all(config, offline=offline)
+    font_paths = {s.name: fonts[s.font] for s in enabled}
 
     # 2. Subset (dedup: later scripts only get codepoints not already covered)
     log.info("Step 2/5: Subsetting fonts...")
     work_dir = Path(tempfile.mkdtemp(prefix="op_fonts_"))
-    subset_entries: list[tuple[Path, bool]] = []  # (path, should_scale)
-    covered_cps: set[int] = set()
-
-    for script in enabled:
-        src = font_paths[script.name]
-        out = work_dir / f"subset_{script.name}.otf"
-        codepoints = _resolve_codepoints(script, config)
-        if covered_cps:
-            codepoints = [cp for cp in codepoints if cp not in covered_cps]
-        if not codepoints:
-            log.info("Skipping %s: all codepoints already covered", script.name)
-            continue
-        try:
-            subset_font(src, codepoints=codepoints, output_path=out)
-            # Track actual cmap (font may not have all requested codepoints)
-            from fontTools.ttLib import TTFont
-            font = TTFont(out)
-            covered_cps.update(font.getBestCmap().keys())
-            font.close()
-            subset_entries.append((out, script.scale))
-        except ValueError as exc:
-            log.warning("Skipping %s: %s", script.name, exc)
-
-    if not subset_entries:
-        raise RuntimeError("All subsets were empty — nothing to merge")
-
-    # Scale each subset to match target cap-height ratio.
-    # If not set, auto-detect from first script (base font).
-    subset_paths = [p for p, _ in subset_entries]
-    target_ratio = config.metrics.target_cap_ratio
-    if target_ratio <= 0:
-        target_ratio = _get_cap_ratio(subset_paths[0])
-    if target_ratio > 0:
-        log.info("Target cap ratio: %.3f", target_ratio)
-        for sp, should_scale in subset_entries:
-            if should_scale:
-                _scale_to_target(sp, target_ratio)
-            else:
-                log.info("Skipping scale for %s (scale = false)", sp.name)
-
-    # 3. Merge
-    log.info("Step 3/5: Merging %d subset fonts...", len(subset_paths))
-    out_dir = Path(config.output_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    output_path = out_dir / config.output
-    merge_fonts(subset_paths, output_path, drop_tables=config.merge.drop_tables)
-
-    # 4. Prune unused GSUB/GPOS features and unreferenced glyphs
-    if config.merge.keep_features:
-        _prune_features(output_path, config.merge.keep_features)
-
-    # 5. Rename, fix metrics & subroutinize
-    log.info("Step 5/5: Setting font metadata...")
-    rename_font(output_path, config.name, config.style, copyright=config.copyright, designer=config.designer)
-    _fix_metrics(output_path, config.metrics)
-    _subroutinize(output_path)
-
-    # Clean up temp dir
-    shutil.rmtree(work_dir, ignore_errors=True)
+    try:
+        jobs = _plan_subsets(enabled, font_paths, config)
+
+        if not jobs:
+            raise RuntimeError("All subsets were empty — nothing to merge")
+
+        # Each subset is scaled to match the target cap-height ratio in the same
+        # pass that subsets it. If not set, auto-detect from the first script
+        # (base font); subsetting leaves head/OS/2 untouched, so its source will do.
+        target_ratio = config.metrics.target_cap_ratio
+        if target_ratio <= 0:
+            target_ratio = _get_cap_ratio(jobs[0][1])
+        if target_ratio > 0:
+            log.info("Target cap ratio: %.3f", target_ratio)
+
+        # Codepoint dedup is already resolved, so the subset jobs are independent
+        # and can run on all cores. Results are collected in config order to keep
+        # the merge order (and thus baseline metrics) deterministic.
+        subset_paths: list[Path] = []
+        with _process_pool(min(len(jobs), workers or os.cpu_count() or 1)) as ex:
+            futures = []
+            for script, src, codepoints in jobs:
+                out = work_dir / f"subset_{script.name}.otf"
+                ratio = target_ratio
+                if ratio > 0 and not script.scale:
+                    log.info("Skipping scale for %s (scale = false)", out.name)
+                    ratio = 0.0
+                futures.append(ex.submit(_subset_job, src, codepoints, out, ratio))
+            for (script, *_), fut in zip(jobs, futures):
+                try:
+                    subset_paths.append(fut.result())
+                except ValueError as exc:
+                    log.warning("Skipping %s: %s", script.name, exc)
+
+        if not subset_paths:
+            raise RuntimeError("All subsets were empty — nothing to merge")
+
+        # 3. Merge
+        log.info("Step 3/5: Merging %d subset fonts...", len(subset_paths))
+        out_dir = Path(config.output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        output_path = out_dir / config.output
+        subsets_size = sum(p.stat().st_size for p in subset_paths)
+
+        # Steps 3-5 share the merged font in memory and save once at the end,
+        # instead of decompiling and recompiling the whole font for every step.
+        font = merge_fonts(subset_paths, drop_tables=config.merge.drop_tables)
+
+        # 4. Prune unused GSUB/GPOS features and unreferenced glyphs
+        if config.merge.keep_features:
+            _prune_features(font, config.merge.keep_features)
+
+        # 5. Rename, fix metrics & subroutinize
+        log.info("Step 5/5: Setting font metadata...")
+        rename_font(font, config.name, config.style, copyright=config.copyright, designer=config.designer)
+        _fix_metrics(font, config.metrics)
+        _subroutinize(font)
+        font.save(str(output_path))
+        glyph_count = _count_glyphs(font)
+        font.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
     final_size = output_path.stat().st_size
     log.info(
-        "Done! %s — %.1f KB (%d glyphs)",
+        "Done! %s — %.1f KB of subsets → %.1f KB (%d glyphs)",
         output_path,
+        subsets_size / 1024,
         final_size / 1024,
-        _count_glyphs(output_path),
+        glyph_count,
     )
     return output_path
 
 
 
-def _prune_features(font_path: Path, keep_features: list[str]) -> None:
+def _prune_features(font, keep_features: list[str]) -> None:
     """Remove GSUB/GPOS features not in keep list, then prune unreferenced glyphs.
 
     Uses fontTools subsetter to re-subset the merged font, keeping only the
@@ -164,10 +285,6 @@ def _prune_features(font_path: Path, keep_features: list[str]) -> None:
     drops alternate glyphs (stylistic sets, CJK variants, etc.) that aren't
     needed for a car UI.
     """
-    from fontTools.ttLib import TTFont
-    from fontTools.subset import Subsetter, Options
-
-    font = TTFont(font_path)
     cmap = font.getBestCmap()
     before_glyphs = len(font.getGlyphOrder())
 
@@ -183,10 +300,6 @@ def _prune_features(font_path: Path, keep_features: list[str]) -> None:
     subsetter.subset(font)
 
     after_glyphs = len(font.getGlyphOrder())
-    font.save(str(font_path))
-    font.close()
-
-    before_size = font_path.stat().st_size  # saved size
     log.info(
         "Step 4/5: Pruned features → kept %s, glyphs %d → %d (removed %d)",
         keep_features, before_glyphs, after_glyphs, before_glyphs - after_glyphs,
@@ -195,51 +308,48 @@ def _prune_features(font_path: Path, keep_features: list[str]) -> None:
 
 def _get_cap_ratio(font_path: Path) -> float:
     """Read a font's cap-height / UPM ratio."""
-    from fontTools.ttLib import TTFont
-    font = TTFont(font_path)
-    upm = font["head"].unitsPerEm
-    cap = font["OS/2"].sCapHeight if font["OS/2"].sCapHeight else 0
-    font.close()
+    with _open_font_ro(font_path) as font:
+        upm = font["head"].unitsPerEm
+        cap = font["OS/2"].sCapHeight if font["OS/2"].sCapHeight else 0
     return cap / upm if upm and cap > 0 else 0.0
 
 
-def _scale_to_target(font_path: Path, target_cap_ratio: float) -> None:
-    """Scale all glyphs in a font so its cap-height ratio matches the target.
+def _scale_to_target(font, target_cap_ratio: float, name: str = "font") -> None:
+    """Scale all glyphs in an open font so its cap-height ratio matches the target.
 
     Each source font may have a different cap-height ratio, so this must run
     per-subset *before* merging to get uniform visual size across mixed sources.
     """
-    from fontTools.ttLib import TTFont
-
-    font = TTFont(font_path)
     upm = font["head"].unitsPerEm
     source_cap = font["OS/2"].sCapHeight if font["OS/2"].sCapHeight else 0
     if source_cap <= 0:
-        font.close()
         return
 
     source_ratio = source_cap / upm
     scale = target_cap_ratio / source_ratio
     if abs(scale - 1.0) < 0.001:
-        font.close()
         return
 
-    log.info("Scaling %s by %.3f (cap ratio %.3f → %.3f)", font_path.name, scale, source_ratio, target_cap_ratio)
+    log.info("Scaling %s by %.3f (cap ratio %.3f → %.3f)", name, scale, source_ratio, target_cap_ratio)
 
     if "CFF " in font:
-        from fontTools.pens.t2CharStringPen import T2CharStringPen
-        from fontTools.pens.transformPen import TransformPen
-
         cff = font["CFF "]
         td = cff.cff.topDictIndex[0]
         cs = td.CharStrings
         hmtx = font["hmtx"]
 
+        # Scale each private dict once, before any glyph is redrawn.
+        privates = {id(cs[gname].private): cs[gname].private for gname in cs.keys()}
+        for private in privates.values():
+            _scale_private(private, scale)
+
         for gname in list(cs.keys()):
             old_cs = cs[gname]
             old_cs.decompile()
             width = hmtx.metrics[gname][0] if gname in hmtx.metrics else 0
-            pen = T2CharStringPen(width=round(width * scale), glyphSet=None)
+            # Charstring widths are stored relative to nominalWidthX.
+            nominal = getattr(old_cs.private, "nominalWidthX", 0)
+            pen = T2CharStringPen(width=round(width * scale) - nominal, glyphSet=None)
             tpen = TransformPen(pen, (scale, 0, 0, scale, 0, 0))
             old_cs.draw(tpen)
             new_cs = pen.getCharString()
@@ -255,19 +365,29 @@ def _scale_to_target(font_path: Path, target_cap_ratio: float) -> None:
     os2.sxHeight = round(os2.sxHeight * scale) if os2.sxHeight else 0
     os2.sCapHeight = round(os2.sCapHeight * scale) if os2.sCapHeight else 0
 
-    font.save(str(font_path))
-    font.close()
+
+# Private dict values that are measured in font units.
+_PRIVATE_SCALED_FIELDS = (
+    "BlueValues", "OtherBlues", "FamilyBlues", "FamilyOtherBlues",
+    "StdHW", "StdVW", "StemSnapH", "StemSnapV",
+    "defaultWidthX", "nominalWidthX",
+)
+
+
+def _scale_private(private, scale: float) -> None:
+    for attr in _PRIVATE_SCALED_FIELDS:
+        value = getattr(private, attr, None)
+        if isinstance(value, list):
+            setattr(private, attr, [otRound(v * scale) for v in value])
+        elif value is not None:
+            setattr(private, attr, otRound(value * scale))
 
 
-def _fix_metrics(font_path: Path, metrics) -> None:
+def _fix_metrics(font, metrics) -> None:
     """Set vertical metrics on the merged font. Skips if ascender/descender are 0."""
     if metrics.ascender == 0 and metrics.descender == 0:
         return
 
-    from fontTools.ttLib import TTFont
-
-    font = TTFont(font_path)
-
     ascender = metrics.ascender
     descender = metrics.descender
 
@@ -283,57 +403,82 @@ def _fix_metrics(font_path: Path, metrics) -> None:
     hhea.descent = descender
     hhea.lineGap = 0
 
-    font.save(str(font_path))
-    font.close()
     log.info("Fixed metrics: ascender=%d, descender=%d", ascender, descender)
 
 
 
 
-def _subroutinize(font_path: Path) -> None:
+def _subroutinize(font) -> None:
     """Re-subroutinize CFF outlines for smaller file size."""
-    from fontTools.ttLib import TTFont
-    font = TTFont(font_path)
     if "CFF " not in font:
-        font.close()
         return
     try:
         import cffsubr
-        before = font_path.stat().st_size
         cffsubr.subroutinize(font)
-        font.save(str(font_path))
-        after = font_path.stat().st_size
-        log.info("Subroutinized: %.1f KB → %.1f KB (%.0f%% smaller)",
-                 before / 1024, after / 1024, (before - after) / before * 100)
+        log.info("Subroutinized CFF outlines")
     except ImportError:
         log.debug("cffsubr not installed, skipping subroutinization")
-    font.close()
 
 
-def _count_glyphs(font_path: Path) -> int:
-    from fontTools.ttLib import TTFont
-    font = TTFont(font_path)
-    count = len(font.getGlyphOrder())
-    font.close()
-    return count
+def _count_glyphs(font) -> int:
+    # maxp.numGlyphs is refreshed on save; avoids materializing the glyph order.
+    return font["maxp"].numGlyphs
 
 
-def build_all(config: BuildConfig) -> list[Path]:
-    """Build all weight variants defined in config."""
-    if not config.weights:
-        return [build(config)]
-
-    outputs = []
-    for weight in config.weights:
-        log.info("=== Building weight: %s ===", weight)
-        cfg = copy.deepcopy(config)
-        cfg.style = weight
-        cfg.output = f"{config.name}-{weight}.otf"
+def _weight_cfg(config: BuildConfig, weight: str) -> BuildConfig:
+    """Return a view of config targeting a single weight variant.
+
+    Only script entries whose font is swapped are copied (shallowly); merge
+    options, metrics and cached codepoint sets are shared with config.
+    """
+    scripts = []
+    for script in config.scripts:
         # Replace "Regular" in font names/URLs for this weight.
         # Scripts with explicit weights only swap if the weight is available.
-        for script in cfg.scripts:
-            if not script.weights or weight in script.weights:
-                script.font = script.font.replace("Regular", weight)
-                script.url = script.url.replace("Regular", weight)
-        outputs.append(build(cfg))
-    return outputs
+        if not script.weights or weight in script.weights:
+            script = copy.copy(script)
+            script.font = script.font.replace("Regular", weight)
+            script.url = script.url.replace("Regular", weight)
+        scripts.append(script)
+    return dataclasses.replace(
+        config,
+        style=weight,
+        output=f"{config.name}-{weight}.otf",
+        scripts=scripts,
+    )
+
+
+def build_all(config: BuildConfig, offline: bool = False) -> list[Path]:
+    """Build all weight variants defined in config.
+
+    Weights share no state once their configs are derived, so each one is
+    built in its own process, with the cores split between them so the
+    per-weight subset pools don't oversubscribe the machine. Outputs are
+    returned in config order.
+    """
+    if not config.weights:
+        return [build(config, offline)]
+
+    # Codepoints don't depend on the weight: resolve them once here so every
+    # derived config (and the copy pickled into each worker) carries the cache
+    # instead of re-reading charset files per weight.
+    for script in config.scripts:
+        if script.enabled:
+            _resolve_codepoints(script, config)
+
+    cfgs = [_weight_cfg(config, weight) for weight in config.weights]
+
+    # Fetch every weight's fonts up front so the parallel builds all hit a
+    # warm cache instead of racing to download the same files.
+    download_plan_parallel([entry for cfg in cfgs for entry in get_download_plan(cfg)], offline=offline)
+
+    cpus = os.cpu_count() or 1
+    procs = min(len(cfgs), cpus)
+    with _process_pool(procs) as ex:
+        futures = [ex.submit(_build_weight, cfg, max(1, cpus // procs)) for cfg in cfgs]
+        return [fut.result() for fut in futures]
+
+
+def _build_weight(config: BuildConfig, workers: int) -> Path:
+    log.info("=== Building weight: %s ===", config.style)
+    return build(config, offline=True, workers=workers)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
 
 from fontTools.subset import Options, Subsetter
@@ -35,9 +36,12 @@ def subset_font(
     unicode_ranges: list[str] | None = None,
     output_path: Path | None = None,
     codepoints: list[int] | None = None,
+    transform: Callable[[TTFont], None] | None = None,
 ) -> Path:
     """Subset a font to only the glyphs covering the given Unicode ranges or codepoints.
 
+    If given, transform is applied to the subset font in memory before it is
+    saved, so further edits don't need another load/save round-trip.
     Returns the path to the subset font (a temp file if output_path is None).
     """
     if codepoints is None:
@@ -51,7 +55,7 @@ def subset_font(
 
     # Check how many requested codepoints exist in the font
     cmap = font.getBestCmap() or {}
-    present = [cp for cp in codepoints if cp in cmap]
+    present = cmap.keys() & set(codepoints)
     if not present:
         log.warning(
             "No glyphs found in %s for any of the %d requested codepoints",
@@ -77,6 +81,8 @@ def subset_font(
     subsetter = Subsetter(options=options)
     subsetter.populate(unicodes=codepoints)
     subsetter.subset(font)
+    if transform is not None:
+        transform(font)
 
     if output_path is None:
         tmp = tempfile.NamedTemporaryFile(suffix=".ttf", delete=False)